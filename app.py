@@ -8,19 +8,24 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, send_file
 from flask_socketio import SocketIO, emit
+from sqlalchemy.orm import joinedload, selectinload
 import time
+import json
 from models import db, Conversation, Message, TravelPreference
+from response_cache import conversation_cache
+from archive import archive_old_messages, get_archive_stats, get_message_content, ARCHIVE_AFTER_DAYS
 import pyttsx3
 import threading
 import requests
 import tempfile
+import click
 import speech_recognition as sr
 from pydub import AudioSegment
 
 # Initialize Flask
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///travel_planner.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///travel_planner.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # Limit file uploads to 16MB
 
@@ -450,7 +455,7 @@ def download(filename):
         ]
         
         # Generate the PDF in memory
-        _, pdf_buffer = create_pdf(itinerary_message.content, answers)
+        _, pdf_buffer = create_pdf(get_message_content(itinerary_message), answers)
         
         # Return the PDF directly from memory
         return send_file(
@@ -508,9 +513,18 @@ def get_conversations():
 
 @app.route('/conversation/<int:conv_id>')
 def get_conversation(conv_id):
-    conversation = Conversation.query.get_or_404(conv_id)
+    cached = conversation_cache.get(conv_id)
+    if cached is None:
+        conversation = Conversation.query.options(
+            selectinload(Conversation.messages).joinedload(Message.archive),
+            joinedload(Conversation.preferences)
+        ).filter_by(id=conv_id).first_or_404()
+        cached = conversation_cache.put(conv_id, serialize_conversation(conversation))
+    return conversation_response(cached)
+
+def serialize_conversation(conversation):
     messages = [{
-        'content': msg.content,
+        'content': get_message_content(msg),
         'is_user': msg.is_user,
         'created_at': msg.created_at.isoformat()
     } for msg in conversation.messages]
@@ -527,13 +541,53 @@ def get_conversation(conv_id):
         'must_see_places': conversation.preferences.must_see_places
     } if conversation.preferences else {}
     
-    return jsonify({
+    return json.dumps({
         'id': conversation.id,
         'destination': conversation.destination,
         'created_at': conversation.created_at.isoformat(),
         'messages': messages,
         'preferences': preferences
-    })
+    }).encode('utf-8')
+
+def conversation_response(cached):
+    use_gzip = cached.gzipped is not None and request.accept_encodings['gzip'] > 0
+    
+    # A client revalidating a copy in either encoding still gets its 304
+    if request.if_none_match.contains_weak(cached.etag):
+        use_gzip = False
+    elif cached.gzip_etag and request.if_none_match.contains_weak(cached.gzip_etag):
+        use_gzip = True
+    
+    if use_gzip:
+        response = app.response_class(cached.gzipped, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(cached.gzip_etag)
+    else:
+        response = app.response_class(cached.body, mimetype='application/json')
+        response.set_etag(cached.etag)
+    
+    # Browsers keep their copy but revalidate it with If-None-Match on every open
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Accept-Encoding')
+    return response.make_conditional(request)
+
+@app.route('/archive/stats')
+def archive_stats():
+    return jsonify(get_archive_stats())
+
+@app.cli.command('archive-messages')
+@click.option('--days', default=ARCHIVE_AFTER_DAYS, help='Archive messages older than this many days.')
+@click.option('--vacuum', is_flag=True, help='Run VACUUM afterwards so SQLite returns the freed pages.')
+def archive_messages_command(days, vacuum):
+    """Move old message bodies into compressed cold storage"""
+    result = archive_old_messages(older_than_days=days)
+    click.echo(f"Archived {result['archived_messages']} messages: "
+          f"{result['original_bytes']} -> {result['stored_bytes']} bytes "
+          f"({result['bytes_saved']} bytes saved)")
+    if vacuum:
+        # VACUUM cannot run inside a transaction
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.execute(db.text('VACUUM'))
 
 @app.route('/process-voice', methods=['POST'])
 def process_voice():
@@ -661,6 +715,9 @@ def store_conversation(answers, messages):
         db.session.add(message)
     
     db.session.commit()
+    # Conversations are write-once, so this id can't be cached yet; it only guards
+    # against a stale entry if ids are ever reused (e.g. after the table is reset)
+    conversation_cache.invalidate(conversation.id)
     return conversation
 
 if __name__ == '__main__':
@@ -0,0 +1,151 @@
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from models import db, Message, ArchivedMessage
+
+# Messages older than this are moved to cold storage by the archive job
+ARCHIVE_AFTER_DAYS = 30
+
+# Length of the preview kept in Message.content once the body is archived
+STUB_PREVIEW_LENGTH = 100
+
+# Preset dictionary of phrases that show up in almost every generated itinerary.
+# zlib back-references into it, which helps most on shorter messages.
+# Never edit this in place: archived blobs need the exact bytes they were written with,
+# so add a new version and codec name instead.
+ITINERARY_ZDICT_V1 = (
+    "TRAVEL METHOD\n\nRecommended transportation options to and around the destination. "
+    "ACCOMMODATION\n\nSuggested places to stay based on preferences and budget. "
+    "Estimated cost value for each place: $ per night "
+    "DAY-BY-DAY ITINERARY\n\nDay 1: Day 2: Day 3: Day 4: Day 5: "
+    "Morning: Afternoon: Evening: Activities and recommendations Plans and attractions "
+    "Activities and dining suggestions "
+    "DINING RECOMMENDATIONS\n\nMust-try local restaurants Popular local dishes "
+    "Dining experiences based on preferences "
+    "LOCAL EXPERIENCES\n\nCultural activities Entertainment options "
+    "Special experiences based on interests "
+    "museum market temple beach park hotel hostel Airbnb breakfast lunch dinner "
+    "public transport rental car taxi walking tour visit explore enjoy the local "
+)
+
+CODECS = {
+    'zlib': {},
+    'zlib-dict-v1': {'zdict': ITINERARY_ZDICT_V1.encode('utf-8')},
+}
+DEFAULT_CODEC = 'zlib-dict-v1'
+
+# Cold path counters, exposed through /archive/stats
+cold_read_lock = threading.Lock()
+cold_read_stats = {
+    'reads': 0,
+    'total_seconds': 0.0,
+    'max_seconds': 0.0
+}
+
+def compress_content(text, codec=DEFAULT_CODEC):
+    compressor = zlib.compressobj(level=9, **CODECS[codec])
+    return compressor.compress(text.encode('utf-8')) + compressor.flush()
+
+def decompress_content(blob, codec):
+    decompressor = zlib.decompressobj(**CODECS[codec])
+    return (decompressor.decompress(blob) + decompressor.flush()).decode('utf-8')
+
+def make_stub(text):
+    if len(text) <= STUB_PREVIEW_LENGTH:
+        return text
+    return text[:STUB_PREVIEW_LENGTH] + "..."
+
+def get_message_content(message):
+    """Return the full message body, decompressing it from cold storage if archived"""
+    # Timed from the first touch of message.archive so the lazy SELECT counts as cold path
+    start = time.perf_counter()
+    archive = message.archive
+    if archive is None:
+        return message.content
+
+    content = decompress_content(archive.compressed_content, archive.codec)
+    elapsed = time.perf_counter() - start
+
+    with cold_read_lock:
+        cold_read_stats['reads'] += 1
+        cold_read_stats['total_seconds'] += elapsed
+        cold_read_stats['max_seconds'] = max(cold_read_stats['max_seconds'], elapsed)
+    return content
+
+def archive_old_messages(older_than_days=ARCHIVE_AFTER_DAYS, codec=DEFAULT_CODEC, batch_size=500):
+    """Move bodies of messages older than the cutoff into ArchivedMessage, leaving preview stubs"""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archived_count = 0
+    original_bytes = 0
+    compressed_bytes = 0
+    last_id = 0
+
+    while True:
+        messages = (Message.query
+                    .outerjoin(ArchivedMessage)
+                    .filter(Message.id > last_id,
+                            Message.created_at < cutoff,
+                            ArchivedMessage.id.is_(None))
+                    .order_by(Message.id)
+                    .limit(batch_size)
+                    .all())
+        if not messages:
+            break
+        last_id = messages[-1].id
+
+        for message in messages:
+            raw_size = len(message.content.encode('utf-8'))
+            stub = make_stub(message.content)
+            blob = compress_content(message.content, codec)
+            stored_size = len(blob) + len(stub.encode('utf-8'))
+
+            # Short bodies are left alone: stub plus blob would not be smaller
+            if stored_size >= raw_size:
+                continue
+
+            db.session.add(ArchivedMessage(
+                message=message,
+                codec=codec,
+                compressed_content=blob,
+                original_size=raw_size
+            ))
+            message.content = stub
+            archived_count += 1
+            original_bytes += raw_size
+            compressed_bytes += stored_size
+
+        db.session.commit()
+
+    return {
+        'archived_messages': archived_count,
+        'original_bytes': original_bytes,
+        'stored_bytes': compressed_bytes,
+        'bytes_saved': original_bytes - compressed_bytes
+    }
+
+def get_archive_stats():
+    """Space saved by cold storage so far, plus latency of cold reads since startup"""
+    archived_messages, original_bytes, compressed_bytes = db.session.query(
+        db.func.count(ArchivedMessage.id),
+        db.func.coalesce(db.func.sum(ArchivedMessage.original_size), 0),
+        db.func.coalesce(db.func.sum(db.func.length(ArchivedMessage.compressed_content)), 0)
+    ).one()
+    # Cast to BLOB so SQLite counts UTF-8 bytes like original_size, not characters
+    stub_bytes = db.session.query(
+        db.func.coalesce(db.func.sum(db.func.length(db.cast(Message.content, db.LargeBinary))), 0)
+    ).join(ArchivedMessage).scalar()
+
+    with cold_read_lock:
+        reads = cold_read_stats['reads']
+        total_seconds = cold_read_stats['total_seconds']
+        max_seconds = cold_read_stats['max_seconds']
+    return {
+        'archived_messages': archived_messages,
+        'original_bytes': original_bytes,
+        'stored_bytes': compressed_bytes + stub_bytes,
+        'bytes_saved': original_bytes - compressed_bytes - stub_bytes,
+        'cold_reads': reads,
+        'cold_read_avg_ms': (total_seconds / reads * 1000) if reads else 0.0,
+        'cold_read_max_ms': max_seconds * 1000
+    }
@@ -0,0 +1,48 @@
+"""Benchmark repeated opens of /conversation/<id>: cold, cached, and 304 revalidation"""
+import sys
+import time
+from app import app
+from models import Conversation
+from response_cache import conversation_cache
+
+def time_requests(client, url, runs, headers=None, clear_cache=False):
+    start = time.perf_counter()
+    for _ in range(runs):
+        if clear_cache:
+            conversation_cache.clear()
+        response = client.get(url, headers=headers or {})
+    elapsed = time.perf_counter() - start
+    return elapsed / runs * 1000, response
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with app.app_context():
+        conversation = Conversation.query.order_by(Conversation.created_at.desc()).first()
+        if not conversation:
+            print("No conversations in the database to benchmark")
+            return
+        url = f"/conversation/{conversation.id}"
+
+    client = app.test_client()
+    gzip_headers = {'Accept-Encoding': 'gzip'}
+
+    uncached_ms, response = time_requests(client, url, runs, gzip_headers, clear_cache=True)
+    plain_size = len(conversation_cache.entries[conversation.id].body)
+    sent_size = len(response.get_data())
+
+    cached_ms, response = time_requests(client, url, runs, gzip_headers)
+    etag = response.headers['ETag']
+
+    revalidate_ms, response = time_requests(client, url, runs, {**gzip_headers, 'If-None-Match': etag})
+    hits, misses = conversation_cache.hits, conversation_cache.misses
+
+    print(f"{url}, {runs} runs each")
+    print(f"  uncached:     {uncached_ms:.3f} ms/request")
+    print(f"  cached:       {cached_ms:.3f} ms/request")
+    print(f"  revalidated:  {revalidate_ms:.3f} ms/request (status {response.status_code})")
+    print(f"  body size:    {plain_size} bytes, {sent_size} bytes on the wire")
+    print(f"  cache:        {hits} hits, {misses} misses")
+
+if __name__ == '__main__':
+    main()
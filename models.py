@@ -16,6 +16,16 @@ class Message(db.Model):
     is_user = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     conversation_id = db.Column(db.Integer, db.ForeignKey('conversation.id'), nullable=False)
+    archive = db.relationship('ArchivedMessage', backref='message', uselist=False)
+
+class ArchivedMessage(db.Model):
+    # Cold storage for old message bodies; Message.content keeps only a short preview stub
+    id = db.Column(db.Integer, primary_key=True)
+    message_id = db.Column(db.Integer, db.ForeignKey('message.id'), nullable=False, unique=True)
+    codec = db.Column(db.String(20), nullable=False)
+    compressed_content = db.Column(db.LargeBinary, nullable=False)
+    original_size = db.Column(db.Integer, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class TravelPreference(db.Model):
     id = db.Column(db.Integer, primary_key=True)
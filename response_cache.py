@@ -0,0 +1,59 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Number of serialized conversations kept in memory
+CONVERSATION_CACHE_SIZE = 256
+
+# Bodies smaller than this are sent uncompressed; gzip overhead isn't worth it
+GZIP_MIN_BYTES = 1024
+
+class CachedResponse:
+    def __init__(self, body):
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.gzipped = None
+        self.gzip_etag = None
+        if len(body) >= GZIP_MIN_BYTES:
+            # Strong validators must differ between content-codings
+            self.gzipped = gzip.compress(body, compresslevel=6)
+            self.gzip_etag = self.etag + '-gzip'
+
+class ResponseCache:
+    """Bounded LRU of serialized API responses, keyed by conversation id"""
+    def __init__(self, max_size=CONVERSATION_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body):
+        entry = CachedResponse(body)
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+conversation_cache = ResponseCache()
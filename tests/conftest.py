@@ -0,0 +1,42 @@
+import os
+import sys
+import pytest
+
+# app.py reads these at import time
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ.setdefault('GROQ_API_KEY', 'test-key')
+os.environ.setdefault('UNSPLASH_ACCESS_KEY', 'test-key')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+from models import db
+from response_cache import conversation_cache
+
+ANSWERS = ['Paris', '2000', 'May 1-5, 2025', '2', 'food, culture', 'hotel', 'balanced', 'public transport', 'Louvre']
+
+@pytest.fixture
+def app():
+    app_module.app.config['TESTING'] = True
+    with app_module.app.app_context():
+        db.drop_all()
+        db.create_all()
+        conversation_cache.clear()
+        yield app_module.app
+        db.session.remove()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def make_conversation(app):
+    def make(content, created_at=None):
+        conversation = app_module.store_conversation(ANSWERS, [{'content': content, 'is_user': False}])
+        if created_at is not None:
+            conversation.created_at = created_at
+            for message in conversation.messages:
+                message.created_at = created_at
+            db.session.commit()
+        return conversation
+    return make
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from io import BytesIO
+import pytest
+import app as app_module
+from archive import (CODECS, archive_old_messages, compress_content, decompress_content,
+                     get_archive_stats, STUB_PREVIEW_LENGTH)
+
+ITINERARY = "DAY-BY-DAY ITINERARY\n\nDay 1: Morning: Louvre, then a café for 20 €. " * 30
+OLD = datetime.utcnow() - timedelta(days=60)
+
+@pytest.mark.parametrize('codec', list(CODECS))
+def test_compress_round_trip(codec):
+    blob = compress_content(ITINERARY, codec)
+    assert len(blob) < len(ITINERARY.encode('utf-8'))
+    assert decompress_content(blob, codec) == ITINERARY
+
+def test_archive_leaves_stub(make_conversation):
+    conversation = make_conversation(ITINERARY, created_at=OLD)
+
+    result = archive_old_messages()
+
+    message = conversation.messages[0]
+    assert result['archived_messages'] == 1
+    assert result['bytes_saved'] > 0
+    assert message.archive is not None
+    assert message.content == ITINERARY[:STUB_PREVIEW_LENGTH] + "..."
+
+def test_archive_skips_short_and_recent_messages(make_conversation):
+    short = make_conversation("Short reply", created_at=OLD)
+    recent = make_conversation(ITINERARY)
+
+    result = archive_old_messages()
+
+    assert result['archived_messages'] == 0
+    assert short.messages[0].archive is None
+    assert short.messages[0].content == "Short reply"
+    assert recent.messages[0].archive is None
+
+def test_archive_stats_count_bytes(make_conversation):
+    make_conversation(ITINERARY, created_at=OLD)
+    result = archive_old_messages()
+
+    stats = get_archive_stats()
+
+    assert stats['original_bytes'] == len(ITINERARY.encode('utf-8'))
+    assert stats['stored_bytes'] == result['stored_bytes']
+    assert stats['bytes_saved'] == result['bytes_saved']
+
+def test_conversation_returns_full_text_after_archiving(client, make_conversation):
+    conversation = make_conversation(ITINERARY, created_at=OLD)
+    archive_old_messages()
+
+    response = client.get(f"/conversation/{conversation.id}")
+
+    assert response.status_code == 200
+    assert response.get_json()['messages'][0]['content'] == ITINERARY
+    assert get_archive_stats()['cold_reads'] >= 1
+
+def test_download_returns_full_text_after_archiving(client, make_conversation, monkeypatch):
+    make_conversation(ITINERARY, created_at=OLD)
+    archive_old_messages()
+    rendered = {}
+
+    def fake_create_pdf(itinerary_text, answers):
+        rendered['text'] = itinerary_text
+        return 'itinerary.pdf', BytesIO(b'%PDF')
+    monkeypatch.setattr(app_module, 'create_pdf', fake_create_pdf)
+
+    response = client.get("/download/itinerary_Paris_20250101.pdf")
+
+    assert response.status_code == 200
+    assert rendered['text'] == ITINERARY
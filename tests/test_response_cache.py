@@ -0,0 +1,85 @@
+import gzip
+from response_cache import ResponseCache, conversation_cache, GZIP_MIN_BYTES
+
+ITINERARY = "DAY-BY-DAY ITINERARY\n\nDay 1: Morning: visit the Louvre and walk along the Seine. " * 40
+
+def test_lru_evicts_least_recently_used():
+    cache = ResponseCache(max_size=2)
+    cache.put(1, b'one')
+    cache.put(2, b'two')
+    cache.get(1)
+    cache.put(3, b'three')
+
+    assert cache.get(2) is None
+    assert cache.get(1).body == b'one'
+    assert cache.get(3).body == b'three'
+    assert len(cache.entries) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+def test_small_bodies_are_not_gzipped():
+    entry = ResponseCache().put(1, b'x' * (GZIP_MIN_BYTES - 1))
+    assert entry.gzipped is None
+    assert entry.gzip_etag is None
+
+def test_gzip_sent_when_accepted(client, make_conversation):
+    conversation = make_conversation(ITINERARY)
+
+    response = client.get(f"/conversation/{conversation.id}", headers={'Accept-Encoding': 'gzip'})
+
+    entry = conversation_cache.get(conversation.id)
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'] == f'"{entry.gzip_etag}"'
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    assert gzip.decompress(response.get_data()) == entry.body
+
+def test_identity_sent_when_gzip_refused(client, make_conversation):
+    conversation = make_conversation(ITINERARY)
+    url = f"/conversation/{conversation.id}"
+
+    for accept in ('identity', 'gzip;q=0', 'identity, *;q=0'):
+        response = client.get(url, headers={'Accept-Encoding': accept})
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
+        assert response.headers['ETag'] == f'"{conversation_cache.get(conversation.id).etag}"'
+        assert response.get_json()['messages'][0]['content'] == ITINERARY
+
+def test_revalidation_returns_304(client, make_conversation):
+    conversation = make_conversation(ITINERARY)
+    url = f"/conversation/{conversation.id}"
+    etag = client.get(url, headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+
+    for if_none_match in (etag, 'W/' + etag):
+        response = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': if_none_match})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert 'Content-Type' not in response.headers
+        assert response.get_data() == b''
+
+def test_revalidation_with_other_encoding_tag_returns_304(client, make_conversation):
+    conversation = make_conversation(ITINERARY)
+    url = f"/conversation/{conversation.id}"
+    identity_etag = client.get(url).headers['ETag']
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': identity_etag})
+
+    assert response.status_code == 304
+
+def test_stale_etag_returns_full_body(client, make_conversation):
+    conversation = make_conversation(ITINERARY)
+
+    response = client.get(f"/conversation/{conversation.id}", headers={'If-None-Match': '"stale"'})
+
+    assert response.status_code == 200
+    assert response.get_json()['id'] == conversation.id
+
+def test_store_conversation_invalidates_cached_id(client, make_conversation):
+    conversation_cache.put(1, b'{"stale": true}')
+
+    conversation = make_conversation(ITINERARY)
+
+    assert conversation.id == 1
+    assert client.get("/conversation/1").get_json()['messages'][0]['content'] == ITINERARY
+
+def test_missing_conversation_is_404(client):
+    assert client.get("/conversation/999").status_code == 404